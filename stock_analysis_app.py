@@ -2,21 +2,92 @@ import streamlit as st
 import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Shared layout applied to every chart
+BASE_LAYOUT = dict(
+    xaxis_title='Date',
+    margin=dict(l=40, r=20, t=40, b=40),
+    template='plotly_white'
+)
+
+# Raised when a batched download returns no usable data
+class NoStockDataError(Exception):
+    pass
+
+# Keep only the columns the app uses, to shrink cached frames.
+# Volume is cast back to int since batched downloads return it as float.
+def trim_stock_data(data):
+    data = data[PRICE_COLUMNS + ['Volume']].copy()
+    data['Volume'] = data['Volume'].fillna(0).astype('int64')
+    return data
 
-# Fetch stock data
-def get_stock_data(ticker, period='1y', interval='1d'):
+# Fetch history for one ticker (no Streamlit calls, safe to run off the main thread)
+def fetch_history(ticker, period='1y', interval='1d'):
+    data = yf.Ticker(ticker).history(period=period, interval=interval)
+    if data.empty or 'Close' not in data.columns:
+        return None
+    return trim_stock_data(data)
+
+# Fetch data for several tickers in one batched request.
+# Only tickers with data are returned; errors and empty batches raise so they aren't cached.
+@st.cache_data(ttl=900, max_entries=64, show_spinner=False)
+def download_stock_data(tickers, period='1y', interval='1d'):
+    tickers = list(tickers)
+    raw = yf.download(tickers, period=period, interval=interval, group_by='ticker',
+                      threads=True, actions=False, auto_adjust=True, ignore_tz=False,
+                      progress=False)
+
+    stock_data = {}
+    for ticker in tickers:
+        data = None
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker in raw.columns.get_level_values(0):
+                data = raw[ticker].dropna(how='all')
+        elif len(tickers) == 1:
+            # Older yfinance returns flat columns for a single ticker
+            data = raw.dropna(how='all')
+        if data is not None and not data.empty and 'Close' in data.columns:
+            stock_data[ticker] = trim_stock_data(data)
+
+    if not stock_data:
+        raise NoStockDataError(f"No data returned for {', '.join(tickers)}")
+    return stock_data
+
+# Fetch data for the selected tickers, retrying the batch's misses on every rerun
+def get_multi_stock_data(tickers, period='1y', interval='1d'):
     try:
-        stock = yf.Ticker(ticker)
-        data = stock.history(period=period, interval=interval)
-        if data.empty or 'Close' not in data.columns:
-            return None
-        return data
+        stock_data = download_stock_data(tuple(sorted(tickers)), period, interval)
+    except NoStockDataError:
+        stock_data = {}
     except Exception as e:
-        st.error(f"Error fetching data for {ticker}: {e}")
-        return None
+        st.warning(f"Batch download failed ({e}); fetching tickers one by one.")
+        stock_data = {}
+
+    # Fall back to per-symbol requests for tickers the batch missed, in parallel
+    missing = [ticker for ticker in tickers if ticker not in stock_data]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), 8)) as executor:
+            futures = {executor.submit(fetch_history, ticker, period, interval): ticker
+                       for ticker in missing}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    stock_data[ticker] = future.result()
+                except Exception as e:
+                    st.error(f"Error fetching data for {ticker}: {e}")
+                    stock_data[ticker] = None
+    return stock_data
 
 # Candlestick chart
 def plot_candlestick(data, stock_symbol):
+    # Bucket long histories to weekly bars so the browser isn't flooded
+    if len(data) > 1000:
+        data = data.resample('W').agg({
+            'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'
+        }).dropna()
     fig = go.Figure(data=[go.Candlestick(
         x=data.index,
         open=data['Open'],
@@ -25,8 +96,8 @@ def plot_candlestick(data, stock_symbol):
         close=data['Close']
     )])
     fig.update_layout(
+        **BASE_LAYOUT,
         title_text=f'Candlestick Chart - {stock_symbol}',
-        xaxis_title='Date',
         yaxis_title='Stock Price',
         xaxis_rangeslider_visible=False
     )
@@ -40,15 +111,15 @@ def calculate_daily_profit_loss(data):
 # Line chart for daily profit/loss
 def plot_profit_loss(data, stock_symbol):
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=data.index,
         y=data['Daily Change'],
         mode='lines',
         name='Daily Change'
     ))
     fig.update_layout(
+        **BASE_LAYOUT,
         title_text=f'Daily Profit/Loss - {stock_symbol}',
-        xaxis_title='Date',
         yaxis_title='Percentage Change'
     )
     return fig
@@ -68,9 +139,14 @@ selected_stocks = st.multiselect('Select stock symbols:', stocks)
 investment_amount = st.number_input('Enter your investment amount:', min_value=0.01, value=1000.0, step=0.01)
 
 stock_data_dict = {}
+if selected_stocks:
+    with st.spinner(f'Fetching stock data for {", ".join(selected_stocks)}...'):
+        fetched_data = get_multi_stock_data(selected_stocks)
+else:
+    fetched_data = {}
+
 for stock_symbol in selected_stocks:
-    with st.spinner(f'Fetching stock data for {stock_symbol}...'):
-        data = get_stock_data(stock_symbol)
+    data = fetched_data.get(stock_symbol)
     if data is None or data.empty:
         st.warning(f"No valid data found for {stock_symbol}. Please check the ticker or try a different interval.")
     else:
@@ -93,8 +169,9 @@ for stock_symbol, stock_data in stock_data_dict.items():
 
     # Investment Simulation
     if 'Daily Change' in stock_data.columns and not stock_data['Daily Change'].isnull().all():
-        cumulative_return = (1 + stock_data['Daily Change'].fillna(0) / 100).cumprod()
-        final_value = investment_amount * cumulative_return.iloc[-1]
+        # Compounded daily changes telescope to the ratio of last to first close
+        close = stock_data['Close'].dropna().to_numpy()
+        final_value = investment_amount * close[-1] / close[0]
 
         st.subheader(f'💰 Investment Simulation - {stock_symbol}')
         st.write(f'Initial Investment: ${investment_amount:,.2f}')